@@ -5,13 +5,21 @@ ZivyObraz.eu client for Raspberry Pi with e-paper display.
 Ported from ESP32/Arduino implementation.
 """
 
+import functools
 import io
 import logging
+import os
+import select
+import signal
 import struct
 import time
 from typing import Optional, Tuple
 
+import numpy as np
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from PIL import Image, ImageDraw, ImageFont
 
 try:
@@ -39,7 +47,16 @@ COLOR_TYPE = "BW"  # Black/White for epd7in5_V2
 COLOR_WHITE = 255
 COLOR_BLACK = 0
 
+# BMP header fields: signature, image offset, width, height (negative for
+# top-to-bottom), depth and compression
+_BMP_HEADER = struct.Struct('<H8xI4xIi2xHI')
 
+# Grayscale value for each RLE color index; color displays' red, yellow
+# etc. are treated as black on the BW display
+_COLOR_LUT = np.array([COLOR_WHITE, COLOR_BLACK] + [COLOR_BLACK] * 254, dtype=np.uint8)
+
+
+@functools.lru_cache(maxsize=1)
 def get_mac_address() -> str:
     """Get MAC address of the device formatted as XX:XX:XX:XX:XX:XX."""
     # Try to get MAC from wlan0 interface first, then eth0
@@ -53,7 +70,6 @@ def get_mac_address() -> str:
             continue
 
     # Fallback: try to find any non-loopback interface
-    import os
     try:
         for iface in os.listdir('/sys/class/net/'):
             if iface == 'lo':
@@ -72,6 +88,7 @@ def get_mac_address() -> str:
     return "00:00:00:00:00:00"
 
 
+@functools.lru_cache(maxsize=1)
 def get_hostname() -> str:
     """Get hostname in format INK_XXXXXXXXXXXX (MAC without colons)."""
     mac = get_mac_address()
@@ -86,9 +103,27 @@ class ZivyObrazClient:
         self.rotation = 0
         self.mac_address = get_mac_address()
         self.hostname = get_hostname()
+        self.http = self._create_session()
+        # Set from the SIGTERM handler, so a plain flag rather than a lock-based
+        # Event; the pipe wakes up the poll sleep
+        self._stop_requested = False
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
         logger.info(f"MAC Address: {self.mac_address}")
         logger.info(f"Hostname: {self.hostname}")
 
+    def _create_session(self) -> requests.Session:
+        """Create HTTP session reusing the server connection between polls."""
+        session = requests.Session()
+        session.headers.update({'User-Agent': f'INK/{FIRMWARE}'})
+
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=retries)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
     def init_display(self):
         """Initialize the e-paper display."""
         logger.info("Initializing display...")
@@ -101,14 +136,27 @@ class ZivyObrazClient:
 
     def display_image(self, image: Image.Image):
         """Display a PIL Image on the e-paper."""
-        # Ensure image is correct size
+        # Ensure image is correct size; output is 1-bit, so nearest neighbour is enough
         if image.size != (DISPLAY_WIDTH, DISPLAY_HEIGHT):
-            image = image.resize((DISPLAY_WIDTH, DISPLAY_HEIGHT))
+            image = image.resize((DISPLAY_WIDTH, DISPLAY_HEIGHT), Image.NEAREST)
+
+        self.epd.display(self._get_buffer(image))
 
-        # Convert to 1-bit
-        image = image.convert('1')
+    def _get_buffer(self, image: Image.Image) -> bytes:
+        """Pack an image into the display frame buffer (1 bit per pixel, 1 = black)."""
+        # Decoders produce pure black/white grayscale, which can be packed as is.
+        # Anything else (including gray levels) is dithered to 1-bit first, like
+        # epd.getbuffer does.
+        black_white = False
+        if image.mode == 'L':
+            colors = image.getcolors(2)
+            black_white = colors is not None and all(c in (COLOR_BLACK, COLOR_WHITE) for _, c in colors)
 
-        self.epd.display(self.epd.getbuffer(image))
+        if not black_white:
+            image = image.convert('1').convert('L')
+
+        # Threshold and pack rows MSB-first in one pass, as epd.getbuffer would
+        return np.packbits(np.asarray(image) < 0x80, axis=1).tobytes()
 
     def display_registration_info(self):
         """Display registration information on the e-paper screen."""
@@ -118,6 +166,13 @@ class ZivyObrazClient:
 
         self.init_display()
 
+        image = self._render_registration_image()
+
+        self.display_image(image)
+        self.sleep_display()
+
+    def _render_registration_image(self) -> Image.Image:
+        """Render the registration information screen."""
         # Create image
         image = Image.new('1', (DISPLAY_WIDTH, DISPLAY_HEIGHT), COLOR_WHITE)
         draw = ImageDraw.Draw(image)
@@ -178,7 +233,9 @@ class ZivyObrazClient:
 
         # QR code for wiki
         if HAS_QRCODE:
-            qr = qrcode.QRCode(version=1, box_size=4, border=2)
+            # Fixed mask pattern skips the penalty scoring of all eight masks
+            qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L,
+                               box_size=4, border=2, mask_pattern=0)
             qr.add_data(URL_WIKI)
             qr.make(fit=True)
             qr_img = qr.make_image(fill_color="black", back_color="white")
@@ -204,8 +261,7 @@ class ZivyObrazClient:
         draw.text(((DISPLAY_WIDTH - text_width) // 2, DISPLAY_HEIGHT - 30),
                   footer_text, font=font_small, fill=COLOR_WHITE)
 
-        self.display_image(image)
-        self.sleep_display()
+        return image
 
     def check_for_update(self) -> Tuple[bool, int, int]:
         """
@@ -230,30 +286,36 @@ class ZivyObrazClient:
         logger.debug(f"Parameters: {params}")
 
         try:
-            response = requests.get(url, params=params, timeout=30)
-            logger.info(f"Response status: {response.status_code}")
+            with self.http.get(url, params=params, timeout=30) as response:
+                logger.info(f"Response status: {response.status_code}")
 
-            if response.status_code != 200:
-                logger.warning(f"Server returned status {response.status_code}")
-                return False, DEFAULT_SLEEP_TIME, 0
+                if response.status_code != 200:
+                    logger.warning(f"Server returned status {response.status_code}")
+                    return False, DEFAULT_SLEEP_TIME, 0
 
-            # Parse headers
-            timestamp_now = 0
-            sleep_time = DEFAULT_SLEEP_TIME
-            rotation = 0
+                # Parse headers
+                timestamp_now = 0
+                sleep_time = DEFAULT_SLEEP_TIME
+                rotation = 0
 
-            for header, value in response.headers.items():
-                header_lower = header.lower()
-                if header_lower == 'timestamp':
+                # Header lookups are case-insensitive
+                value = response.headers.get('Timestamp')
+                if value:
                     timestamp_now = int(value)
                     logger.info(f"Timestamp from server: {timestamp_now}")
-                elif header_lower == 'sleep':
+
+                value = response.headers.get('Sleep')
+                if value:
                     sleep_time = int(value) * 60  # Convert minutes to seconds
                     logger.info(f"Sleep time: {sleep_time} seconds ({value} minutes)")
-                elif header_lower == 'sleepseconds':
+
+                value = response.headers.get('SleepSeconds')
+                if value:
                     sleep_time = int(value)
                     logger.info(f"Sleep time: {sleep_time} seconds")
-                elif header_lower == 'rotate':
+
+                value = response.headers.get('Rotate')
+                if value:
                     rotation = int(value)
                     logger.info(f"Rotation: {rotation}")
 
@@ -293,34 +355,17 @@ class ZivyObrazClient:
         logger.info("Downloading image...")
 
         try:
-            response = requests.get(url, params=params, timeout=60, stream=True)
+            with self.http.get(url, params=params, timeout=60, stream=True) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to download image: status {response.status_code}")
+                    return False
 
-            if response.status_code != 200:
-                logger.error(f"Failed to download image: status {response.status_code}")
-                return False
+                # Read the body straight from the socket into a single buffer
+                # instead of joining chunks through response.content
+                response.raw.decode_content = True
+                data = response.raw.read()
 
-            # Read first 2 bytes to determine format
-            data = response.content
-            if len(data) < 2:
-                logger.error("Response too short")
-                return False
-
-            header = struct.unpack('<H', data[:2])[0]
-            logger.info(f"Image format header: 0x{header:04X}")
-
-            self.init_display()
-
-            if header == 0x4D42:  # BMP signature "BM"
-                image = self.decode_bmp(data)
-            elif header == 0x315A:  # Z1 format
-                image = self.decode_rle_z1(data)
-            elif header == 0x325A:  # Z2 format
-                image = self.decode_rle_z2(data)
-            elif header == 0x335A:  # Z3 format
-                image = self.decode_rle_z3(data)
-            else:
-                logger.error(f"Unknown image format: 0x{header:04X}")
-                return False
+            image = self.decode_image(data)
 
             if image is None:
                 logger.error("Failed to decode image")
@@ -334,19 +379,42 @@ class ZivyObrazClient:
             elif self.rotation == 3:
                 image = image.rotate(90, expand=True)
 
+            self.init_display()
             self.display_image(image)
             self.sleep_display()
 
             logger.info("Image displayed successfully")
             return True
 
-        except requests.RequestException as e:
+        except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
             logger.error(f"Failed to download image: {e}")
             return False
         except Exception as e:
             logger.error(f"Error processing image: {e}")
             return False
 
+    def decode_image(self, data: bytes) -> Optional[Image.Image]:
+        """Decode image data in any of the supported formats."""
+        # Read first 2 bytes to determine format
+        if len(data) < 2:
+            logger.error("Response too short")
+            return None
+
+        header = struct.unpack('<H', data[:2])[0]
+        logger.info(f"Image format header: 0x{header:04X}")
+
+        if header == 0x4D42:  # BMP signature "BM"
+            return self.decode_bmp(data)
+        elif header == 0x315A:  # Z1 format
+            return self.decode_rle_z1(data)
+        elif header == 0x325A:  # Z2 format
+            return self.decode_rle_z2(data)
+        elif header == 0x335A:  # Z3 format
+            return self.decode_rle_z3(data)
+        else:
+            logger.error(f"Unknown image format: 0x{header:04X}")
+            return None
+
     def decode_bmp(self, data: bytes) -> Optional[Image.Image]:
         """Decode BMP format image data."""
         logger.info("Decoding BMP image...")
@@ -358,159 +426,81 @@ class ZivyObrazClient:
                 return None
 
             # BMP header structure
-            signature = struct.unpack('<H', data[0:2])[0]
+            signature, image_offset, width, height, depth, compression = _BMP_HEADER.unpack_from(data)
             if signature != 0x4D42:
                 logger.error("Invalid BMP signature")
                 return None
 
-            file_size = struct.unpack('<I', data[2:6])[0]
-            image_offset = struct.unpack('<I', data[10:14])[0]
-            header_size = struct.unpack('<I', data[14:18])[0]
-            width = struct.unpack('<I', data[18:22])[0]
-            height = struct.unpack('<i', data[22:26])[0]  # Signed for flip detection
-            planes = struct.unpack('<H', data[26:28])[0]
-            depth = struct.unpack('<H', data[28:30])[0]
-            compression = struct.unpack('<I', data[30:34])[0]
-
             logger.info(f"BMP: {width}x{abs(height)}, {depth}bpp, compression={compression}")
 
-            if planes != 1:
-                logger.error(f"Unsupported planes: {planes}")
-                return None
+            # Pillow scales 5/6-bit channels to the full 0-255 range, the firmware
+            # only shifts them, so 16bpp is thresholded from the raw pixel words
+            if depth == 16:
+                whitish = self._whitish_bmp16(data, image_offset, width, height, compression)
+                return Image.fromarray(np.where(whitish, COLOR_WHITE, COLOR_BLACK).astype(np.uint8))
+
+            # Pillow's BMP decoder handles palettes, bitfields, padding and row order
+            image = Image.open(io.BytesIO(data))
+            image.load()
+
+            # 1bpp black/white bitmaps are unpacked by Pillow already
+            if image.mode == '1':
+                return image.convert('L')
+
+            # Indexed images: threshold the palette like the firmware does and
+            # map pixel indices through it; indices past the palette are white
+            if image.mode == 'P':
+                palette = np.array(image.getpalette(), dtype=np.uint16).reshape(-1, 3)
+                lut = np.full(256, COLOR_WHITE, dtype=np.uint8)
+                lut[:len(palette)] = np.where(palette.sum(axis=1) // 3 > 0x80, COLOR_WHITE, COLOR_BLACK)
+                return Image.fromarray(lut[np.asarray(image)])
+
+            # Same whitish test as the firmware: r + g + b > 3 * 0x80
+            rgb = np.asarray(image.convert('RGB'))
+            whitish = rgb.sum(axis=2, dtype=np.uint16) > 3 * 0x80
+            return Image.fromarray(np.where(whitish, COLOR_WHITE, COLOR_BLACK).astype(np.uint8))
 
-            if compression not in (0, 3):  # 0=uncompressed, 3=565
-                logger.error(f"Unsupported compression: {compression}")
-                return None
+        except Exception as e:
+            logger.error(f"BMP decode error: {e}")
+            return None
 
-            # Handle negative height (top-to-bottom)
-            flip = height > 0
-            height = abs(height)
+    def _whitish_bmp16(self, data: bytes, image_offset: int, width: int, height: int,
+                       compression: int) -> np.ndarray:
+        """Apply the firmware's whitish test to 16bpp BMP pixel data (555 or 565)."""
+        rows = abs(height)
+        row_words = (width * 2 + 3) // 4 * 2  # Rows are padded to 4 bytes
 
-            # Create output image
-            image = Image.new('L', (width, height), COLOR_WHITE)
-            pixels = image.load()
+        words = np.frombuffer(data, dtype='<u2', count=rows * row_words, offset=image_offset)
+        words = words.reshape(rows, row_words)[:, :width]
+        lsb = words & 0xFF
+        msb = words >> 8
 
-            # Calculate row size (padded to 4-byte boundary)
-            if depth < 8:
-                row_size = ((width * depth + 31) // 32) * 4
-            else:
-                row_size = ((width * depth // 8 + 3) // 4) * 4
-
-            # Read palette for indexed images
-            palette = []
-            if depth <= 8:
-                palette_offset = 14 + header_size
-                num_colors = 1 << depth
-                for i in range(num_colors):
-                    idx = palette_offset + i * 4
-                    if idx + 4 <= len(data):
-                        b, g, r, _ = struct.unpack('BBBB', data[idx:idx + 4])
-                        # Convert to grayscale and determine if whitish
-                        gray = (r + g + b) // 3
-                        palette.append(COLOR_WHITE if gray > 0x80 else COLOR_BLACK)
-                    else:
-                        palette.append(COLOR_WHITE)
-
-            # Read pixel data
-            for row in range(height):
-                if flip:
-                    y = height - 1 - row
-                else:
-                    y = row
-
-                row_offset = image_offset + row * row_size
-
-                if depth == 1:
-                    for col in range(width):
-                        byte_idx = row_offset + col // 8
-                        if byte_idx < len(data):
-                            bit = 7 - (col % 8)
-                            pn = (data[byte_idx] >> bit) & 1
-                            pixels[col, y] = palette[pn] if pn < len(palette) else COLOR_WHITE
-
-                elif depth == 4:
-                    for col in range(width):
-                        byte_idx = row_offset + col // 2
-                        if byte_idx < len(data):
-                            if col % 2 == 0:
-                                pn = (data[byte_idx] >> 4) & 0x0F
-                            else:
-                                pn = data[byte_idx] & 0x0F
-                            pixels[col, y] = palette[pn] if pn < len(palette) else COLOR_WHITE
-
-                elif depth == 8:
-                    for col in range(width):
-                        byte_idx = row_offset + col
-                        if byte_idx < len(data):
-                            pn = data[byte_idx]
-                            pixels[col, y] = palette[pn] if pn < len(palette) else COLOR_WHITE
-
-                elif depth == 16:
-                    for col in range(width):
-                        byte_idx = row_offset + col * 2
-                        if byte_idx + 1 < len(data):
-                            lsb = data[byte_idx]
-                            msb = data[byte_idx + 1]
-                            if compression == 0:  # 555
-                                r = (msb & 0x7C) << 1
-                                g = ((msb & 0x03) << 6) | ((lsb & 0xE0) >> 2)
-                                b = (lsb & 0x1F) << 3
-                            else:  # 565
-                                r = msb & 0xF8
-                                g = ((msb & 0x07) << 5) | ((lsb & 0xE0) >> 3)
-                                b = (lsb & 0x1F) << 3
-
-                            whitish = (r + g + b) > 3 * 0x80
-                            pixels[col, y] = COLOR_WHITE if whitish else COLOR_BLACK
-
-                elif depth in (24, 32):
-                    bytes_per_pixel = depth // 8
-                    for col in range(width):
-                        byte_idx = row_offset + col * bytes_per_pixel
-                        if byte_idx + 2 < len(data):
-                            b = data[byte_idx]
-                            g = data[byte_idx + 1]
-                            r = data[byte_idx + 2]
-
-                            whitish = (r + g + b) > 3 * 0x80
-                            pixels[col, y] = COLOR_WHITE if whitish else COLOR_BLACK
-
-            return image.convert('1')
+        if compression == 0:  # 555
+            r = (msb & 0x7C) << 1
+            g = ((msb & 0x03) << 6) | ((lsb & 0xE0) >> 2)
+            b = (lsb & 0x1F) << 3
+        else:  # 565
+            r = msb & 0xF8
+            g = ((msb & 0x07) << 5) | ((lsb & 0xE0) >> 3)
+            b = (lsb & 0x1F) << 3
 
-        except Exception as e:
-            logger.error(f"BMP decode error: {e}")
-            return None
+        whitish = (r + g + b) > 3 * 0x80
+
+        # Positive height means rows are stored bottom-up
+        return whitish[::-1] if height > 0 else whitish
 
     def decode_rle_z1(self, data: bytes) -> Optional[Image.Image]:
         """Decode ZivyObraz Z1 RLE format (1 byte color + 1 byte count)."""
         logger.info("Decoding Z1 RLE image...")
 
         try:
-            image = Image.new('L', (DISPLAY_WIDTH, DISPLAY_HEIGHT), COLOR_WHITE)
-            pixels = image.load()
-
-            idx = 2  # Skip header
-            x, y = 0, 0
+            arr = np.frombuffer(data, dtype=np.uint8, offset=2)  # Skip header
+            runs = len(arr) // 2
 
-            while idx + 1 < len(data) and y < DISPLAY_HEIGHT:
-                pixel_color = data[idx]
-                count = data[idx + 1]
-                idx += 2
+            pixel_colors = arr[0:runs * 2:2]
+            counts = arr[1:runs * 2:2]
 
-                color = self._get_color_from_index(pixel_color)
-
-                for _ in range(count):
-                    if x < DISPLAY_WIDTH and y < DISPLAY_HEIGHT:
-                        pixels[x, y] = color
-                    x += 1
-                    if x >= DISPLAY_WIDTH:
-                        x = 0
-                        y += 1
-                        if y >= DISPLAY_HEIGHT:
-                            break
-
-            logger.info(f"Z1 decoded: {idx} bytes read")
-            return image.convert('1')
+            return self._expand_runs("Z1", pixel_colors, counts, 2)
 
         except Exception as e:
             logger.error(f"Z1 decode error: {e}")
@@ -521,33 +511,12 @@ class ZivyObrazClient:
         logger.info("Decoding Z2 RLE image...")
 
         try:
-            image = Image.new('L', (DISPLAY_WIDTH, DISPLAY_HEIGHT), COLOR_WHITE)
-            pixels = image.load()
-
-            idx = 2  # Skip header
-            x, y = 0, 0
-
-            while idx < len(data) and y < DISPLAY_HEIGHT:
-                compressed = data[idx]
-                idx += 1
+            arr = np.frombuffer(data, dtype=np.uint8, offset=2)  # Skip header
 
-                count = compressed & 0b00111111
-                pixel_color = (compressed & 0b11000000) >> 6
+            counts = arr & 0b00111111
+            pixel_colors = (arr & 0b11000000) >> 6
 
-                color = self._get_color_from_index(pixel_color)
-
-                for _ in range(count):
-                    if x < DISPLAY_WIDTH and y < DISPLAY_HEIGHT:
-                        pixels[x, y] = color
-                    x += 1
-                    if x >= DISPLAY_WIDTH:
-                        x = 0
-                        y += 1
-                        if y >= DISPLAY_HEIGHT:
-                            break
-
-            logger.info(f"Z2 decoded: {idx} bytes read")
-            return image.convert('1')
+            return self._expand_runs("Z2", pixel_colors, counts, 1)
 
         except Exception as e:
             logger.error(f"Z2 decode error: {e}")
@@ -558,47 +527,68 @@ class ZivyObrazClient:
         logger.info("Decoding Z3 RLE image...")
 
         try:
-            image = Image.new('L', (DISPLAY_WIDTH, DISPLAY_HEIGHT), COLOR_WHITE)
-            pixels = image.load()
+            arr = np.frombuffer(data, dtype=np.uint8, offset=2)  # Skip header
 
-            idx = 2  # Skip header
-            x, y = 0, 0
+            counts = arr & 0b00011111
+            pixel_colors = (arr & 0b11100000) >> 5
 
-            while idx < len(data) and y < DISPLAY_HEIGHT:
-                compressed = data[idx]
-                idx += 1
+            return self._expand_runs("Z3", pixel_colors, counts, 1)
 
-                count = compressed & 0b00011111
-                pixel_color = (compressed & 0b11100000) >> 5
+        except Exception as e:
+            logger.error(f"Z3 decode error: {e}")
+            return None
 
-                color = self._get_color_from_index(pixel_color)
+    def _expand_runs(self, name: str, pixel_colors: np.ndarray, counts: np.ndarray,
+                     run_size: int) -> Image.Image:
+        """Expand decoded RLE runs into a display-sized black/white grayscale image."""
+        total = DISPLAY_WIDTH * DISPLAY_HEIGHT
 
-                for _ in range(count):
-                    if x < DISPLAY_WIDTH and y < DISPLAY_HEIGHT:
-                        pixels[x, y] = color
-                    x += 1
-                    if x >= DISPLAY_WIDTH:
-                        x = 0
-                        y += 1
-                        if y >= DISPLAY_HEIGHT:
-                            break
+        # Stop after the run that fills the last pixel, like the firmware does
+        ends = np.cumsum(counts, dtype=np.int64)
+        used = min(int(np.searchsorted(ends, total)) + 1, len(counts))
 
-            logger.info(f"Z3 decoded: {idx} bytes read")
-            return image.convert('1')
+        pixels = np.repeat(_COLOR_LUT[pixel_colors[:used]], counts[:used])
 
-        except Exception as e:
-            logger.error(f"Z3 decode error: {e}")
-            return None
+        # Pixels not covered by the stream stay white
+        buf = np.full(total, COLOR_WHITE, dtype=np.uint8)
+        filled = min(len(pixels), total)
+        buf[:filled] = pixels[:filled]
 
-    def _get_color_from_index(self, pixel_color: int) -> int:
-        """Convert color index to grayscale value for BW display."""
-        if pixel_color == 0:
-            return COLOR_WHITE
-        elif pixel_color == 1:
-            return COLOR_BLACK
-        else:
-            # For color displays (red, yellow, etc.), treat as black on BW display
-            return COLOR_BLACK
+        logger.info(f"{name} decoded: {2 + used * run_size} bytes read")
+        return Image.frombuffer('L', (DISPLAY_WIDTH, DISPLAY_HEIGHT), buf, 'raw', 'L', 0, 1)
+
+    def stop(self):
+        """Ask the main loop to exit, interrupting any pending sleep."""
+        self._stop_requested = True
+        try:
+            os.write(self._wakeup_w, b'\0')
+        except BlockingIOError:
+            pass  # Pipe already full, the sleep will wake up anyway
+
+    def _handle_sigterm(self, signum, frame):
+        """Stop the main loop when the service is terminated."""
+        # Only set the flag here; set_wakeup_fd already woke up the sleep
+        self._stop_requested = True
+
+    def _sleep(self, seconds: float) -> bool:
+        """
+        Sleep until the timeout or a stop request.
+        Returns: True if the client should stop
+        """
+        deadline = time.monotonic() + seconds
+        while not self._stop_requested:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            readable, _, _ = select.select([self._wakeup_r], [], [], remaining)
+            if readable:
+                try:
+                    os.read(self._wakeup_r, 512)
+                except BlockingIOError:
+                    pass
+
+        return self._stop_requested
 
     def run(self):
         """Main loop."""
@@ -606,9 +596,13 @@ class ZivyObrazClient:
         logger.info(f"MAC: {self.mac_address}")
         logger.info(f"Display: {DISPLAY_WIDTH}x{DISPLAY_HEIGHT}")
 
+        # Let systemd stop the service without waiting out the sleep
+        old_wakeup_fd = signal.set_wakeup_fd(self._wakeup_w)
+        signal.signal(signal.SIGTERM, self._handle_sigterm)
+
         first_run = True
 
-        while True:
+        while not self._stop_requested:
             try:
                 needs_update, sleep_time, rotation = self.check_for_update()
 
@@ -624,7 +618,8 @@ class ZivyObrazClient:
                     first_run = False
 
                 logger.info(f"Sleeping for {sleep_time} seconds...")
-                time.sleep(sleep_time)
+                if self._sleep(sleep_time):
+                    break
 
             except KeyboardInterrupt:
                 logger.info("Interrupted by user")
@@ -637,7 +632,10 @@ class ZivyObrazClient:
                     except BaseException:
                         pass
                     first_run = False
-                time.sleep(DEFAULT_SLEEP_TIME)
+                self._sleep(DEFAULT_SLEEP_TIME)
+
+        signal.set_wakeup_fd(old_wakeup_fd)
+        logger.info("ZivyObraz client stopped")
 
 
 def main():